@@ -2,11 +2,13 @@ from typing import Union, Optional
 from pathlib import Path
 
 import shutil
+import string
 import subprocess
 import time
 import logging
 import sys
 
+from .core import initialize, shutdown
 from .errors import MT5Error
 from .templates.dynamic.config import CFG_TEMPLATE
 
@@ -114,19 +116,17 @@ class Connection:
         )
 
         Path.mkdir(Path(self.config_path).parent, exist_ok=True)
-        lines = self.config_template.splitlines()
-        with open(self.config_path, "w") as f:
-            for line in lines:
-                if "$" in line:
-                    words = line.split("=")
-                    # Should be split in two
-                    if words[1][0] == "$":
-                        value = sub[words[1][1:]]
-                        if value is not None:
-                            words[1] = str(value)
-                            f.write("=".join(words) + "\n")
-                else:
-                    f.write(line + "\n")
+        # Lines whose value wasn't provided are left out entirely
+        missing = [f"${key}" for key in sub if sub[key] is None]
+        lines = [
+            line
+            for line in self.config_template.splitlines()
+            if not any(placeholder in line for placeholder in missing)
+        ]
+        content = string.Template("\n".join(lines) + "\n").safe_substitute(
+            {key: str(value) for key, value in sub.items() if value is not None}
+        )
+        Path(self.config_path).write_text(content)
         log.debug(f"Created {self.config_path}")
         for key in sub:
             log.debug(f"MT5 config {key} = {sub[key]}")
@@ -240,10 +240,23 @@ class Connection:
         self.process = subprocess.Popen(args)
         log.info(f"Started MT5 terminal with pid {self.process.pid}")
 
-        time.sleep(2)  # Could be done better but it works
-
+        # Keeps trying to bind to the terminal until it's ready (or we time out)
         log.debug(f"Inializing MT5 pipeline ...")
-        initialized = _mt5.initialize(path=self.path, portable=True)
+        deadline = time.monotonic() + self.timeout
+        while True:
+            # Caps each attempt to what's left of the budget, otherwise a single
+            # call could block for initialize's own 60s default
+            remaining = max(1, int((deadline - time.monotonic()) * 1000))
+            initialized = initialize(
+                path=self.path, portable=True, timeout=remaining
+            )
+            if initialized or time.monotonic() >= deadline:
+                break
+            time.sleep(0.05)
+        if not initialized:
+            log.error("MT5 last_error: %s", _mt5.last_error())
+            self.__exit__(None, None, None)
+            raise MT5Error("Couldn't initialize the connection with the MT5 terminal")
         log.info("Connection with MT5 terminal successful")
 
         self.account_info = _mt5.account_info()
@@ -260,7 +273,8 @@ class Connection:
     def __exit__(self, exc_type, exc_value, traceback):
 
         log.debug(f"Shutting down MT5 pipeline ...")
-        shutdown = _mt5.shutdown()
+        # Also deselects the symbols that were kept loaded during the session
+        shutdown()
         log.info("Disconnection from MT5 terminal successful")
 
         self.process.terminate()
@@ -9,50 +9,99 @@ import MetaTrader5 as _mt5
 from bettermt5.errors import MT5Error
 
 
+def _retry(fn, predicate, tries=14, base=0.005, cap=0.1):
+    """Calls fn until predicate(result) is true or it runs out of tries,
+    sleeping with exponential backoff (base, 2*base, ... up to cap) in between.
+    Returns the last result either way. The defaults add up to ~1s of sleep,
+    like the old flat 10 x 100ms loops."""
+    for i in range(tries):
+        result = fn()
+        if predicate(result):
+            break
+        if i < tries - 1:
+            time.sleep(min(cap, base * 2**i))
+    return result
+
+
+# Symbols selected in the Market Watch by load_symbol, kept selected until
+# flush_symbols is called so repeated calls don't pay for select/deselect
+_SELECTED = set()
+
+
+def flush_symbols():
+    """Deselect every symbol that was selected by load_symbol."""
+    for symbol in _SELECTED:
+        # Tries to deselect it, if it can't it's fine
+        _mt5.symbol_select(symbol, False)
+    _SELECTED.clear()
+
+
+def initialize(*args, **kwargs):
+    """Establish a connection with the MetaTrader 5 terminal."""
+    # A new session starts from the terminal's own Market Watch
+    _SELECTED.clear()
+    return _mt5.initialize(*args, **kwargs)
+
+
+def shutdown():
+    """Close the previously established connection to the MetaTrader 5 terminal."""
+    flush_symbols()
+    return _mt5.shutdown()
+
+
+def symbol_select(symbol, enable=True):
+    """Select a symbol in the MarketWatch window or remove a symbol from the window."""
+    selected = _mt5.symbol_select(symbol, enable)
+    if not enable or not selected:
+        _SELECTED.discard(symbol)
+    return selected
+
+
 def load_symbol(fn):
     @functools.wraps(fn)
     def wrapper(data: Union[str, dict], *args, **kwargs):
         symbol = data["symbol"] if isinstance(data, dict) else data
-        loaded = _mt5.symbol_select(symbol)
-        if not loaded:
-            raise MT5Error(f"Couldn't load {symbol}")
-        result = fn(data, *args, **kwargs)
-        # Tries to deselect it, if it can't it's fine
-        _mt5.symbol_select(symbol, False)
-        return result
+        if symbol not in _SELECTED:
+            loaded = _mt5.symbol_select(symbol)
+            if not loaded:
+                raise MT5Error(f"Couldn't load {symbol}")
+            _SELECTED.add(symbol)
+        return fn(data, *args, **kwargs)
 
     return wrapper
 
 @load_symbol
 def symbol_info(symbol, *args, **kwargs):
     """Get data on the specified financial instrument."""
-    for _ in range(10):
-        info = _mt5.symbol_info(symbol, *args, **kwargs)
-        if info.trade_tick_value > 0: # HACK: this is because of a bug in MT5 where sometimes it returns 0
-            return info
-        time.sleep(0.1)
+    info = _retry(
+        lambda: _mt5.symbol_info(symbol, *args, **kwargs),
+        # HACK: this is because of a bug in MT5 where sometimes it returns 0
+        lambda info: info.trade_tick_value > 0,
+    )
+    if info.trade_tick_value > 0:
+        return info
 
 
 @load_symbol
 def symbol_info_tick(symbol, *args, **kwargs):
     """Get the last tick for the specified financial instrument."""
-    for _ in range(10):
-        tick = _mt5.symbol_info_tick(symbol, *args, **kwargs)
-        if tick.time > 1:
-            break
-        time.sleep(0.1)
+    tick = _retry(
+        lambda: _mt5.symbol_info_tick(symbol, *args, **kwargs),
+        lambda tick: tick.time > 1,
+    )
     if tick.time < 1:
         raise MT5Error(f"Couldn't load data for symbol {symbol}")
     return tick
 
 @load_symbol
-def order_send(order: dict, retries=10):
+def order_send(order: dict, retries=14):
     """Send an order to the MetaTrader 5 terminal."""
-    for _ in range(retries):
-        r = _mt5.order_send(order)
-        if r is None:
-            return None
-        if r.retcode != _mt5.TRADE_RETCODE_REQUOTE and r.retcode != _mt5.TRADE_RETCODE_PRICE_OFF:
-            break
-        time.sleep(0.1)
-    return r
\ No newline at end of file
+    return _retry(
+        lambda: _mt5.order_send(order),
+        lambda r: r is None
+        or (
+            r.retcode != _mt5.TRADE_RETCODE_REQUOTE
+            and r.retcode != _mt5.TRADE_RETCODE_PRICE_OFF
+        ),
+        tries=retries,
+    )
\ No newline at end of file
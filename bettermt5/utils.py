@@ -1,12 +1,31 @@
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+import functools
 import subprocess
 import os
 import platform
+import time
+
+import pandas as pd
+import pymt5adapter as mt5
+from pymt5adapter.const import TIMEFRAME
+
+# this is REALLY counterintuitive (would expect GMT+2/+3) but here's the explanation:
+# https://stackoverflow.com/questions/54842491/printing-datetime-as-pytz-timezoneetc-gmt-5-yields-incorrect-result
+_NYTZ = ZoneInfo("US/Eastern")
+_GMT2 = ZoneInfo("Etc/GMT-2")
+_GMT3 = ZoneInfo("Etc/GMT-3")
 
 
 def are_datetimes_eq(date1, date2, window=1):
     """Since datetimes don't support the __eq__ operator per se, this function
     will determine if two dates are in the same windowed range (in seconds), and
     return True if they are (which basically means that they are that much close to e.o.)"""
+    # Timestamps can be compared on their integer nanoseconds directly
+    if isinstance(date1, pd.Timestamp) and isinstance(date2, pd.Timestamp):
+        if (date1.tz is None) != (date2.tz is None):
+            raise TypeError("Cannot compare tz-naive and tz-aware timestamps")
+        return abs(date1.value - date2.value) <= window * 1_000_000_000
     return abs((date1 - date2).total_seconds()) <= window
 
 
@@ -18,17 +37,19 @@ def get_current_tz_offset():
     TO-DO: allow function to work even if "EURUSD" isn't supported by broker"""
 
     last_candle = mt5.copy_rates_from_pos("EURUSD", TIMEFRAME.M1, start_pos=0, count=1)
-    last_candle_time = datetime.fromtimestamp(last_candle[0][0])
-    reference = datetime.utcnow().replace(second=0, microsecond=0)
-    offset = (last_candle_time - reference).total_seconds() / 3600
+    # both are epoch seconds, the reference is the current time truncated to the minute
+    reference = int(time.time()) // 60 * 60
+    offset = (last_candle[0][0] - reference) / 3600
 
     return offset
 
 
+@functools.lru_cache(maxsize=None)
 def to_seconds(timeframe: TIMEFRAME):
     return mt5.period_seconds(timeframe)
 
 
+@functools.lru_cache(maxsize=None)
 def to_timedelta(timeframe: TIMEFRAME):
     return timedelta(seconds=to_seconds(timeframe))
 
@@ -39,23 +60,21 @@ def localized_date_to_mt5(date):
     This function was written with GMT+2/+3 offset in mind. If the
     broker tz is not one of these, it might produce unexpected results"""
 
-    # timezones
-    nytz = pytz.timezone("US/Eastern")
-    gmt2 = pytz.timezone("Etc/GMT-2")
-    gmt3 = pytz.timezone("Etc/GMT-3")
+    # datetimes and Timestamps share the same cache entry
+    return _localized_date_to_mt5(pd.Timestamp(date))
 
-    # convert to nytz
-    nydate = date.astimezone(nytz)
 
-    # if date is a Timestamp object, convert to datetime
-    if isinstance(date, pd.Timestamp):
-        date = date.to_pydatetime()
+@functools.lru_cache(maxsize=4096)
+def _localized_date_to_mt5(date: pd.Timestamp) -> datetime:
+    """Cached implementation of localized_date_to_mt5, since the same
+    anchor dates tend to be requested over and over (e.g. in backtests)"""
 
-    # check if it's dst, if it is, assign gmt3
-    if bool(nydate.dst()):
-        return date.astimezone(gmt3).replace(tzinfo=pytz.UTC)
-    else:
-        return date.astimezone(gmt2).replace(tzinfo=pytz.UTC)
+    # work on a plain datetime from here on
+    date = date.to_pydatetime()
+
+    # check if it's dst in ny, if it is, assign gmt3
+    target = _GMT3 if date.astimezone(_NYTZ).dst() else _GMT2
+    return date.astimezone(target).replace(tzinfo=timezone.utc)
 
 
 def mt5_date_to_utc(data):
@@ -66,45 +85,49 @@ def mt5_date_to_utc(data):
     This function was written with GMT+2/+3 offset in mind. If the
     broker tz is not one of these, it might produce unexpected results"""
 
-    nytz = pytz.timezone("US/Eastern")
-
-    # this is REALLY counterintuitive (would expect GMT+2/+3) but here's the explanation:
-    # https://stackoverflow.com/questions/54842491/printing-datetime-as-pytz-timezoneetc-gmt-5-yields-incorrect-result
-    gmt2 = pytz.timezone("Etc/GMT-2")
-    gmt3 = pytz.timezone("Etc/GMT-3")
-
-    try:
+    if isinstance(data, datetime):
 
         date = data
 
         # localize mt5 date to gmt2 (might be wrong, we don't know yet)
-        gmt2date = gmt2.localize(date)
-        gmt3date = gmt3.localize(date)
+        gmt2date = date.replace(tzinfo=_GMT2)
 
         # turn it into ny time
-        nydate = gmt2date.astimezone(nytz)
+        nydate = gmt2date.astimezone(_NYTZ)
 
-        # check if it's dst, if it is, gmt2 is wrong, return utc
+        # check if it's dst, if it is, gmt2 is wrong, localize to gmt3 and return utc
         if bool(nydate.dst()):
-            return gmt3date.astimezone(pytz.utc)
+            return date.replace(tzinfo=_GMT3).astimezone(timezone.utc)
 
         # if it's not, localize to gmt2 and then return utc
         else:
-            return gmt2date.astimezone(pytz.utc)
+            return gmt2date.astimezone(timezone.utc)
 
-    except AttributeError:
+    else:
 
-        # iterates over bar/ticks and adjusts the dates
+        # adjusts the dates of all bars/ticks at once
         df = pd.DataFrame(data)
         # if df is empty, return it
         if df.shape[0] == 0:
             return df
-        # convert time in seconds/ms into the datetime format
-        df["time"] = pd.to_datetime(df["time"], unit="s")
+        # convert time in seconds/ms into the datetime format (only once,
+        # straight from the underlying array)
         if "time_msc" in df.columns:
-            df["time"] = pd.to_datetime(df["time_msc"], unit="ms")
-        # applies itself to column
-        df["time"] = df["time"].map(lambda d: mt5_date_to_utc(d))
+            idx = pd.to_datetime(df["time_msc"].to_numpy(), unit="ms")
+        else:
+            idx = pd.to_datetime(df["time"].to_numpy(), unit="s")
+        # same logic as above, but over the whole column: localize to gmt2,
+        # check dst in ny time and pick either the gmt3 or the gmt2 result
+        # dst only changes on the hour, so it's enough to check it once per
+        # distinct hour and broadcast the result back to every row
+        hours = idx.floor("h")
+        unique_hours = hours.unique()
+        nyhours = unique_hours.tz_localize(_GMT2).tz_convert(_NYTZ)
+        hour_dst = nyhours.map(lambda t: t.dst() != timedelta(0)).to_numpy(dtype=bool)
+        dst_mask = hour_dst[unique_hours.get_indexer(hours)]
+        utc_gmt2 = idx.tz_localize(_GMT2).tz_convert(timezone.utc)
+        utc_gmt3 = idx.tz_localize(_GMT3).tz_convert(timezone.utc)
+        df["time"] = utc_gmt3.where(dst_mask, utc_gmt2)
 
         return df
 
@@ -126,9 +149,10 @@ def is_datetime_exactly_at_start_of_timeframe_range(
     starting from 15:00, which we don't want, as it is one candle too early (as the 15:05
     candle already contains info about what happened at 15:05). So, in order to fix this, we
     need to understand whether a date is exactly at the start of the timeframe range or not."""
-    if time.timestamp() % to_seconds(timeframe) == 0:
-        return True
-    return False
+    # integer epoch math, a sub-second remainder can never be aligned
+    if time.microsecond:
+        return False
+    return int(time.timestamp()) % to_seconds(timeframe) == 0
 
 
 def main():
@@ -19,6 +19,7 @@ setuptools.setup(
         "bettermt5.templates.dynamic",
     ],
     install_requires=["MetaTrader5"],
-    python_requires=">=3.6",
+    extras_require={"utils": ["pandas", "pymt5adapter", "tzdata"]},
+    python_requires=">=3.9",
     include_package_data=True
 )